@@ -0,0 +1,125 @@
+"""
+Group-commit benchmark'ı.
+
+Aynı yazma yükünü (N thread, her biri tek satır ekleyip commit bekler)
+önce istek başına commit ile, sonra farklı pencere/batch ayarlarıyla
+GroupCommitWriter üzerinden çalıştırır; throughput ve istek gecikmesini
+(p50 / p99) yan yana basar.
+
+Varsayılan hedef, synchronous=FULL ayarlı bir SQLite dosyasıdır (her commit
+gerçek bir fsync). Postgres ile ölçmek için:
+
+    BENCH_DATABASE_URL=postgresql+psycopg2://... python bench/group_commit_bench.py
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import Column, Integer, String, create_engine, event
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from group_commit import GroupCommitWriter  # noqa: E402
+
+Base = declarative_base()
+
+
+class BenchRow(Base):
+    __tablename__ = "group_commit_bench"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    payload = Column(String(64), nullable=False)
+
+
+def make_engine():
+    url = os.getenv("BENCH_DATABASE_URL")
+    if url:
+        engine = create_engine(url, pool_size=32, max_overflow=32)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "bench.sqlite")
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+
+        @event.listens_for(engine, "connect")
+        def _pragmas(conn, _):
+            cur = conn.cursor()
+            cur.execute("PRAGMA journal_mode=WAL")
+            cur.execute("PRAGMA synchronous=FULL")
+            cur.close()
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def run_load(write_one, threads: int, per_thread: int):
+    latencies = []
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        for _ in range(per_thread):
+            t0 = time.perf_counter()
+            write_one()
+            local.append(time.perf_counter() - t0)
+        with lock:
+            latencies.extend(local)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "ops_per_s": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    threads = int(os.getenv("BENCH_THREADS", "16"))
+    per_thread = int(os.getenv("BENCH_OPS_PER_THREAD", "100"))
+    engine = make_engine()
+    # SQLite tek yazıcıya izin verir; per-request modunu da seri yapıyoruz ki
+    # "database is locked" hataları ölçümü bozmasın.
+    sqlite_lock = threading.Lock() if engine.dialect.name == "sqlite" else None
+
+    def per_request_commit():
+        with Session(engine) as session:
+            session.add(BenchRow(payload="x"))
+            if sqlite_lock is None:
+                session.commit()
+            else:
+                with sqlite_lock:
+                    session.commit()
+
+    @contextmanager
+    def session_scope():
+        with Session(engine) as session:
+            yield session
+
+    def insert_op(session):
+        session.add(BenchRow(payload="x"))
+
+    print(f"{'mod':<28}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    r = run_load(per_request_commit, threads, per_thread)
+    print(f"{'istek basina commit':<28}{r['ops_per_s']:>10.0f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+
+    for window_ms, max_batch in [(1, 16), (2, 64), (5, 64), (10, 256)]:
+        writer = GroupCommitWriter(session_scope, window_ms=window_ms, max_batch=max_batch)
+        r = run_load(lambda: writer.run(insert_op), threads, per_thread)
+        label = f"group window={window_ms}ms max={max_batch}"
+        print(f"{label:<28}{r['ops_per_s']:>10.0f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Soğuk başlangıç (import) benchmark'ı.
+
+Her ölçüm yeni bir Python sürecinde yapılır (modül cache'i yok):
+
+  - python -c "pass"                  -> yorumlayıcının kendi maliyeti (taban)
+  - import app                        -> API modülü
+  - import app; app.create_app()      -> API modülü + uygulama oluşturma
+  - import mcp.tools                  -> saf MCP tool fonksiyonları
+
+Tabandan farklar medyan olarak basılır. Bütçe ve tembel import kontrolü
+testlerdedir (tests/test_startup.py).
+
+    python bench/import_time_bench.py
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CASES = {
+    "import app": "import app",
+    "create_app()": "import app; app.create_app(start_background=False)",
+    "import mcp.tools": "import mcp.tools",
+}
+
+
+def run(code: str) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+    return (time.perf_counter() - t0) * 1000
+
+
+def main():
+    rounds = int(os.getenv("IMPORT_BENCH_ROUNDS", "7"))
+
+    baseline = statistics.median(run("pass") for _ in range(rounds))
+    print(f"{'taban (python -c pass)':<24}{baseline:8.1f} ms")
+
+    for label, code in CASES.items():
+        elapsed = statistics.median(run(code) for _ in range(rounds)) - baseline
+        print(f"{label:<24}{elapsed:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Canlı kuyruk benchmark'ı.
+
+100k canlı siparişi (varsayılan: 1000 restorana dağıtılmış) LiveQueueIndex'e
+yükler ve şunları basar:
+
+  - 100k sipariş başına bellek maliyeti (tracemalloc ile)
+  - aynı veriyi düz dict kayıtlarla tutmanın maliyeti (karşılaştırma için)
+  - restoran başına kuyruk okuma / sayma süresi (mikrosaniye)
+
+Veritabanı gerekmez; loader sentetik veri üretir.
+
+    python bench/live_queue_bench.py
+    BENCH_LIVE_ORDERS=500000 BENCH_RESTAURANTS=5000 python bench/live_queue_bench.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from live_queue import LiveOrder, LiveQueueIndex  # noqa: E402
+
+ITEMS = [["Hamburger", "Kola"], ["Pizza"], ["Lahmacun", "Ayran", "Künefe"]]
+
+
+def synthetic_rows(n: int, restaurants: int):
+    now = time.time()
+    for i in range(n):
+        yield (
+            i % restaurants + 1,
+            LiveOrder(f"ORD-{int(now)}-{i:06x}", i % 5000 + 1, 150.75, ITEMS[i % 3], now + i),
+        )
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    obj = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    return obj, size
+
+
+def main():
+    n = int(os.getenv("BENCH_LIVE_ORDERS", "100000"))
+    restaurants = int(os.getenv("BENCH_RESTAURANTS", "1000"))
+    per_100k = 100_000 / n
+
+    def build_index():
+        index = LiveQueueIndex(lambda restaurant_id=None: synthetic_rows(n, restaurants))
+        index.ensure_loaded()
+        return index
+
+    def build_dicts():
+        queues = {}
+        for rid, o in synthetic_rows(n, restaurants):
+            queues.setdefault(rid, {})[o.id] = {
+                "id": o.id, "status": "PAYMENT_SUCCESS", "amount": o.amount,
+                "items": o.items, "user_id": o.user_id,
+                "restaurant_id": rid, "created_at": o.created_at,
+            }
+        return queues
+
+    index, index_bytes = measure(build_index)
+    _, dict_bytes = measure(build_dicts)
+
+    print(f"canli siparis: {n}, restoran: {restaurants}")
+    print(f"LiveQueueIndex (__slots__): {index_bytes * per_100k / 2**20:8.1f} MiB / 100k siparis")
+    print(f"dict kayitlar (karsilastirma): {dict_bytes * per_100k / 2**20:8.1f} MiB / 100k siparis")
+
+    rounds = 10_000
+    t0 = time.perf_counter()
+    for i in range(rounds):
+        index.count(i % restaurants + 1)
+    count_us = (time.perf_counter() - t0) / rounds * 1e6
+
+    t0 = time.perf_counter()
+    for i in range(rounds):
+        [o.to_dict(i % restaurants + 1) for o in index.orders(i % restaurants + 1)]
+    read_us = (time.perf_counter() - t0) / rounds * 1e6
+
+    print(f"count(restaurant_id):       {count_us:8.2f} us")
+    print(f"orders(restaurant_id)+dict: {read_us:8.2f} us  (~{n // restaurants} siparis/restoran)")
+
+
+if __name__ == "__main__":
+    main()
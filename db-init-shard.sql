@@ -0,0 +1,46 @@
+-- =========================================
+--  SHARD VERİTABANI KURULUMU
+-- =========================================
+-- SHARD_DATABASE_URLS içindeki her ek shard veritabanında çalıştırılır.
+-- Shard'larda sadece orders tablosu bulunur; users ve restaurants ana
+-- veritabanında kaldığı için yabancı anahtar (FOREIGN KEY) tanımlanmaz.
+DROP SCHEMA IF EXISTS yemek_kuyrugu CASCADE;
+
+CREATE SCHEMA yemek_kuyrugu;
+SET search_path TO yemek_kuyrugu;
+
+CREATE TYPE order_status AS ENUM (
+    'PAYMENT_SUCCESS',
+    'CONFIRMED',
+    'CANCELLED',
+    'REJECTED'
+);
+
+CREATE TABLE orders (
+    id              VARCHAR(64) PRIMARY KEY,
+    user_id         INTEGER NOT NULL,
+    restaurant_id   INTEGER NOT NULL,
+
+    amount          NUMERIC(10,2) NOT NULL,
+    items           JSONB NOT NULL,
+
+    status          order_status NOT NULL,
+    transaction_id  VARCHAR(64),
+
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    last_updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    status_history  JSONB NOT NULL DEFAULT '[]'::JSONB
+);
+
+-- =========================================
+--  İNDEKSLER
+-- =========================================
+
+CREATE INDEX idx_orders_user_id
+    ON orders(user_id);
+
+CREATE INDEX idx_orders_restaurant_id
+    ON orders(restaurant_id);
+
+CREATE INDEX idx_orders_status
+    ON orders(status);
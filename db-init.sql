@@ -67,6 +67,18 @@ CREATE TABLE session_tokens (
     expires_at  TIMESTAMPTZ
 );
 
+-- Sharding: başka shard'a taşınmış restoranlar (halka yerine buraya bakılır).
+-- Shard veritabanları için bkz. db-init-shard.sql
+CREATE TABLE shard_overrides (
+    restaurant_id   INTEGER PRIMARY KEY,
+    shard           VARCHAR(64) NOT NULL,
+    -- Taşıma sırasında TRUE: restoranın yazmaları reddedilir
+    moving          BOOLEAN NOT NULL DEFAULT FALSE,
+    -- pin-shard-owners ile geçici sabitleme: rebalance-shards yeni sahibine taşır
+    pinned          BOOLEAN NOT NULL DEFAULT FALSE,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- =========================================
 --  İNDEKSLER
 -- =========================================
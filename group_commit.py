@@ -0,0 +1,125 @@
+"""
+Group-commit yazıcısı.
+
+Her istek kendi db.session.commit() çağrısını yaptığında, yoğun saatlerde
+her istek için ayrı bir fsync bekleniyor. Bu modül, süreç başına tek bir
+yazıcı thread'i çalıştırır: gelen yazma işlemlerini (sipariş ekleme, durum
+geçişi) birkaç milisaniye boyunca toplar ve tek bir transaction içinde
+commit eder. Her istek, batch kalıcı hale geldikten sonra kendi sonucunu alır.
+
+Bir "işlem" (op), session alıp sonuç döndüren basit bir fonksiyondur:
+
+    def op(session):
+        session.add(order)
+        return order.id
+
+Her op kendi SAVEPOINT'i içinde çalışır; bir op hata verirse sadece o istek
+hata alır, batch'teki diğer işlemler commit edilmeye devam eder.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+
+class GroupCommitWriter:
+    """
+    Yazma işlemlerini toplayıp tek commit ile kalıcı hale getiren yazıcı.
+
+    Parametreler:
+      - session_scope: Her batch için session üreten context manager fabrikası
+      - window_ms: İlk işlem geldikten sonra batch'in açık kalacağı süre
+      - max_batch: Bir batch'teki en fazla işlem sayısı (dolunca beklemeden flush)
+    """
+
+    def __init__(self, session_scope, window_ms: float = 5, max_batch: int = 64):
+        if window_ms < 0:
+            raise ValueError("window_ms negatif olamaz")
+        if max_batch < 1:
+            raise ValueError("max_batch en az 1 olmalı")
+
+        self._session_scope = session_scope
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def submit(self, op) -> Future:
+        """İşlemi kuyruğa ekler; batch commit edilince tamamlanan Future döner."""
+        self._ensure_started()
+        fut = Future()
+        self._queue.put((op, fut))
+        return fut
+
+    def run(self, op, timeout: float | None = None):
+        """İşlemi gönderir ve batch kalıcı olana kadar bekleyip sonucunu döner."""
+        return self.submit(op).result(timeout=timeout)
+
+    # ----------------------------
+    #  İç işleyiş
+    # ----------------------------
+
+    def _ensure_started(self):
+        # fork sonrası (ör. gunicorn worker) thread çocuk sürece taşınmaz;
+        # pid değiştiyse kuyruk ve thread bu süreç için yeniden kurulur.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._loop, name="group-commit-writer", daemon=True
+            )
+            self._thread.start()
+
+    def _collect(self):
+        """Bir batch toplar: ilk işlemi bekler, sonra pencere/limit dolana kadar ekler."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            self._flush(self._collect())
+
+    def _flush(self, batch):
+        outcomes = []
+        try:
+            with self._session_scope() as session:
+                for op, fut in batch:
+                    if not fut.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with session.begin_nested():
+                            outcomes.append((fut, op(session), None))
+                    except Exception as e:
+                        outcomes.append((fut, None, e))
+
+                session.commit()
+        except Exception as e:
+            # Commit (veya session kurulumu) başarısız: batch'in tamamı kalıcı değil.
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for fut, result, error in outcomes:
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
@@ -0,0 +1,54 @@
+"""
+Gunicorn ayarları (preload + fork-safe mod).
+
+    gunicorn -c gunicorn.conf.py
+
+preload_app açıkken uygulama master süreçte bir kez import edilip
+oluşturulur, worker'lar fork ile bu hazır süreçten kopyalanır; böylece her
+worker import maliyetini tekrar ödemez. Fork güvenliği için:
+
+  - Master'da arka plan thread'i başlatılmaz (start_background=False).
+  - Fork sonrası master'dan kalan DB bağlantıları worker'da kullanılmaz;
+    ana veritabanı ve tüm shard engine'lerinin pool'u sıfırlanır
+    (engine.dispose(close=False)).
+  - Canlı kuyruk ön yüklemesi her worker'da ayrı başlatılır.
+
+Zamanlayıcı (otomatik red) worker'larda çalıştırılmaz: her worker kendi
+zamanlayıcısını başlatırsa aynı siparişler paralel olarak reddedilir; tek
+worker'da da gunicorn yeniden başlatmalarında eski ve yeni worker bir süre
+birlikte çalışır. Gunicorn altında SCHEDULER_ENABLED=1 reddedilir;
+zamanlayıcı ayrı bir süreçte çalıştırılır (flask run-scheduler).
+
+Ortam değişkenleri:
+  - GUNICORN_BIND (varsayılan 0.0.0.0:5000)
+  - GUNICORN_WORKERS (varsayılan 2)
+  - GUNICORN_PRELOAD (varsayılan 1)
+"""
+
+import os
+
+wsgi_app = "app:create_app(start_background=False)"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", "2"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+if os.getenv("SCHEDULER_ENABLED", "0") == "1":
+    raise RuntimeError(
+        "SCHEDULER_ENABLED=1 gunicorn altında desteklenmez; "
+        "zamanlayıcıyı ayrı bir süreçte çalıştırın: FLASK_APP=app.py flask run-scheduler"
+    )
+
+
+def post_fork(server, worker):
+    from app import db, start_background_tasks
+
+    flask_app = worker.app.wsgi()
+    with flask_app.app_context():
+        # Master'dan kopyalanan bağlantıları kapatmadan pool'dan düşür;
+        # worker kendi bağlantılarını açar. Shard engine'leri de aynı şekilde.
+        engines = {id(db.engine): db.engine}
+        router = flask_app.extensions["yemek_kuyrugu"].router
+        engines.update((id(e), e) for e in router.engines.values())
+        for engine in engines.values():
+            engine.dispose(close=False)
+    start_background_tasks(flask_app, scheduler=False)
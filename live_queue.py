@@ -0,0 +1,347 @@
+"""
+Restoran başına canlı mutfak kuyruğu (in-memory).
+
+Restoran sahipleri çoğunlukla sadece henüz sonuçlanmamış (PAYMENT_SUCCESS)
+siparişlerle ilgilenir. Bu modül, bu siparişleri restaurant_id bazında
+bellekte tutar; böylece kuyruğu okumak için tüm sipariş geçmişini
+sorgulayıp serialize etmek gerekmez.
+
+- LiveOrder: __slots__ kullanan kompakt kayıt (dict'e göre çok daha az bellek)
+- LiveQueueIndex: restaurant_id -> {order_id: LiveOrder} (eklenme = created_at sırası)
+
+İndeks ilk kullanımda veritabanından yüklenir (warm-load), sonra sipariş
+oluşturma ve durum geçişleriyle güncellenir. Birden fazla worker/süreç
+varsa değişiklikler Postgres LISTEN/NOTIFY ile yayılır: bildirim, yazmayı
+yapan transaction'ın içinde gönderilir ve sadece commit olursa teslim edilir.
+
+Başka bileşenler (ör. zamanlayıcı) subscribe() ile kuyruğa giren / çıkan
+siparişlerden haberdar olabilir; hem yerel hem bildirimle gelen değişiklikler
+aynı şekilde iletilir.
+"""
+
+import json
+import logging
+import os
+import select
+import threading
+import time
+import uuid
+
+from sqlalchemy import text
+
+LIVE_STATUS = "PAYMENT_SUCCESS"
+NOTIFY_CHANNEL = "yemek_kuyrugu_live_queue"
+
+# Postgres NOTIFY payload sınırı 8000 byte; üstündeyse sadece "reload" gönderilir.
+_MAX_PAYLOAD = 7900
+# Dinleyici bağlantısı koparsa yeniden bağlanmadan önce beklenen süre (sn).
+_RECONNECT_DELAY_S = 1.0
+_MAX_RECONNECT_DELAY_S = 30.0
+
+logger = logging.getLogger(__name__)
+
+# Bildirimlerin hangi süreçten geldiğini ayırt etmek için süreç başına rastgele
+# kimlik. PID kullanılamaz: aynı Postgres'i paylaşan farklı container / host'lardaki
+# worker'lar aynı PID'leri alabilir. fork sonrası çocukta yeniden üretilir.
+_origin = None
+_origin_pid = None
+
+
+def process_origin() -> str:
+    global _origin, _origin_pid
+    if _origin_pid != os.getpid():
+        _origin = uuid.uuid4().hex
+        _origin_pid = os.getpid()
+    return _origin
+
+
+class LiveOrder:
+    """Kuyruktaki tek sipariş. Sadece mutfağın ihtiyaç duyduğu alanlar tutulur."""
+
+    __slots__ = ("id", "user_id", "amount", "items", "created_at")
+
+    def __init__(self, id: str, user_id: int, amount: float, items, created_at: float | None):
+        self.id = id
+        self.user_id = user_id
+        self.amount = amount
+        # JSONB değeri olduğu gibi tutulur (liste olmak zorunda değil).
+        self.items = items
+        self.created_at = created_at
+
+    def to_dict(self, restaurant_id: int) -> dict:
+        return {
+            "id": self.id,
+            "status": LIVE_STATUS,
+            "amount": self.amount,
+            "items": self.items,
+            "user_id": self.user_id,
+            "restaurant_id": restaurant_id,
+            "created_at": self.created_at,
+        }
+
+
+class LiveQueueIndex:
+    """
+    restaurant_id -> canlı siparişler indeksi.
+
+    Parametreler:
+      - loader: loader(restaurant_id=None) -> (restaurant_id, LiveOrder) iterable'ı.
+        restaurant_id verilirse sadece o restoranın canlı siparişleri döner.
+      - engine_factory: LISTEN/NOTIFY için SQLAlchemy engine (veya shard'lı kurulumda
+        engine listesi) döndüren fonksiyon (opsiyonel)
+    """
+
+    def __init__(self, loader, engine_factory=None):
+        self._loader = loader
+        self._engine_factory = engine_factory
+        self._lock = threading.RLock()
+        self._queues: dict[int, dict[str, LiveOrder]] = {}
+        self._loaded = False
+        self._pid = None
+        self._listeners = []
+        self._subscribers = []
+
+    def subscribe(self, subscriber):
+        """
+        subscriber.added(restaurant_id, LiveOrder) ve subscriber.removed(restaurant_id, order_id)
+        metodları, indeks değiştikçe (kilit altında, değişiklik sırasıyla) çağrılır.
+        """
+        with self._lock:
+            self._subscribers.append(subscriber)
+
+    # ----------------------------
+    #  Okuma
+    # ----------------------------
+
+    def orders(self, restaurant_id: int) -> list[LiveOrder]:
+        """Restoranın canlı siparişleri, en eskiden en yeniye."""
+        self.ensure_loaded()
+        with self._lock:
+            return list(self._queues.get(restaurant_id, {}).values())
+
+    def count(self, restaurant_id: int) -> int:
+        self.ensure_loaded()
+        with self._lock:
+            return len(self._queues.get(restaurant_id, ()))
+
+    def oldest(self, restaurant_id: int) -> LiveOrder | None:
+        """Restoranın kuyruğundaki en eski sipariş (kuyruk kopyalanmadan)."""
+        self.ensure_loaded()
+        with self._lock:
+            return next(iter(self._queues.get(restaurant_id, {}).values()), None)
+
+    def counts(self, restaurant_ids) -> dict[int, int]:
+        self.ensure_loaded()
+        with self._lock:
+            return {rid: len(self._queues.get(rid, ())) for rid in restaurant_ids}
+
+    # ----------------------------
+    #  Güncelleme
+    # ----------------------------
+
+    def add(self, restaurant_id: int, order: LiveOrder):
+        with self._lock:
+            if not self._loaded:
+                return  # warm-load sırasında zaten veritabanından okunacak
+            queue = self._queues.setdefault(restaurant_id, {})
+            if order.id in queue:
+                return
+            last = next(reversed(queue.values()), None)
+            queue[order.id] = order
+            for sub in self._subscribers:
+                sub.added(restaurant_id, order)
+            # Genelde sipariş sırası korunur; eski created_at ile gelen nadir
+            # kayıtlar için (ör. geç gelen bildirim) kuyruğu yeniden sırala.
+            if (
+                last is not None
+                and last.created_at is not None
+                and order.created_at is not None
+                and last.created_at > order.created_at
+            ):
+                self._queues[restaurant_id] = dict(
+                    sorted(queue.items(), key=lambda kv: kv[1].created_at or 0)
+                )
+
+    def discard(self, restaurant_id: int, order_id: str):
+        with self._lock:
+            queue = self._queues.get(restaurant_id)
+            if queue is None:
+                return
+            if queue.pop(order_id, None) is None:
+                return
+            if not queue:
+                del self._queues[restaurant_id]
+            for sub in self._subscribers:
+                sub.removed(restaurant_id, order_id)
+
+    def reload(self, restaurant_id: int | None = None):
+        """Tüm indeksi (veya tek restoranı) veritabanından yeniden yükler."""
+        fresh: dict[int, dict[str, LiveOrder]] = {}
+        for rid, order in self._loader(restaurant_id):
+            fresh.setdefault(rid, {})[order.id] = order
+        with self._lock:
+            if restaurant_id is None:
+                old = self._queues
+                self._queues = fresh
+                self._loaded = True
+            else:
+                old = {restaurant_id: self._queues.pop(restaurant_id, {})}
+                if fresh.get(restaurant_id):
+                    self._queues[restaurant_id] = fresh[restaurant_id]
+            if self._subscribers:
+                self._notify_diff(old, fresh)
+
+    def _notify_diff(self, old, fresh):
+        for rid, queue in old.items():
+            new_queue = fresh.get(rid, {})
+            for order_id in queue:
+                if order_id not in new_queue:
+                    for sub in self._subscribers:
+                        sub.removed(rid, order_id)
+        for rid, queue in fresh.items():
+            old_queue = old.get(rid, {})
+            for order_id, order in queue.items():
+                if order_id not in old_queue:
+                    for sub in self._subscribers:
+                        sub.added(rid, order)
+
+    def ensure_loaded(self):
+        # fork sonrası çocuk süreç, ebeveynin indeksini ve listener
+        # bağlantısını kullanamaz; pid değiştiyse baştan yüklenir.
+        if self._loaded and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._loaded and self._pid == os.getpid():
+                return
+            self._loaded = False
+            self._queues = {}
+            self._pid = os.getpid()
+            # Listener yüklemeden önce başlar ki yükleme sırasında commit
+            # olan değişiklikler kaçmasın.
+            self._start_listener()
+            self.reload()
+
+    # ----------------------------
+    #  Değişiklik bildirimleri
+    # ----------------------------
+
+    def _start_listener(self):
+        if self._engine_factory is None:
+            return
+        engines = self._engine_factory()
+        if not isinstance(engines, (list, tuple)):
+            engines = [engines]
+        # NOTIFY sadece aynı veritabanındaki dinleyicilere gider; her shard ayrı dinlenir.
+        for engine in engines:
+            if engine.dialect.name != "postgresql":
+                continue
+            ready = threading.Event()
+            listener = threading.Thread(
+                target=self._listen, args=(engine, ready), name="live-queue-listener", daemon=True
+            )
+            listener.start()
+            self._listeners.append(listener)
+            ready.wait(timeout=5)
+
+    def _listen(self, engine, ready):
+        """
+        Bağlantı koparsa (veya bildirim işlenirken hata olursa) bekleyip yeniden
+        bağlanır. Kopukken kaçan bildirimler bilinmediği için yeniden LISTEN
+        sonrası indeks veritabanından baştan yüklenir.
+        """
+        delay = _RECONNECT_DELAY_S
+        reconnect = False
+        while self._pid == os.getpid():
+            try:
+                self._listen_once(engine, ready, reload_first=reconnect)
+            except Exception:
+                logger.exception(
+                    "Canlı kuyruk dinleyicisi hata verdi, %.0f sn sonra yeniden bağlanılıyor", delay
+                )
+                time.sleep(delay)
+                delay = min(delay * 2, _MAX_RECONNECT_DELAY_S)
+            else:
+                delay = _RECONNECT_DELAY_S
+            finally:
+                ready.set()
+            reconnect = True
+
+    def _listen_once(self, engine, ready, reload_first: bool):
+        raw = engine.raw_connection()
+        # Bağlantı pool'dan ayrılır: autocommit + LISTEN durumundaki bağlantı,
+        # hata sonrası close() ile pool'a geri dönüp başka bir session'a
+        # (transaction'sız) verilmesin; close() bağlantıyı gerçekten kapatır.
+        conn = raw.driver_connection
+        raw.detach()
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            if reload_first:
+                self.reload()
+            ready.set()
+            while self._pid == os.getpid():
+                if select.select([conn], [], [], 5) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    payload = conn.notifies.pop(0).payload
+                    try:
+                        event = json.loads(payload)
+                    except ValueError:
+                        logger.warning(
+                            "Okunamayan canlı kuyruk bildirimi, indeks yeniden yükleniyor: %r", payload
+                        )
+                        self.reload()
+                        continue
+                    self.apply_event(event)
+        finally:
+            raw.close()
+
+    def apply_event(self, event: dict):
+        """Bildirimle gelen değişikliği uygular (bu sürecin kendi yazmaları hariç)."""
+        if event.get("origin") == process_origin():
+            return
+        rid = event["restaurant_id"]
+        if event["op"] == "add":
+            o = event["order"]
+            self.add(rid, LiveOrder(o["id"], o["user_id"], o["amount"], o["items"], o["created_at"]))
+        elif event["op"] == "remove":
+            self.discard(rid, event["order_id"])
+        elif event["op"] == "reload":
+            self.reload(rid)
+
+
+def notify_add(session, restaurant_id: int, order: LiveOrder):
+    """Sipariş canlı kuyruğa girdiğinde diğer süreçlere bildirim (transaction içinde)."""
+    _notify(session, {
+        "op": "add",
+        "restaurant_id": restaurant_id,
+        "order": {
+            "id": order.id,
+            "user_id": order.user_id,
+            "amount": order.amount,
+            "items": order.items,
+            "created_at": order.created_at,
+        },
+    })
+
+
+def notify_remove(session, restaurant_id: int, order_id: str):
+    """Sipariş canlı kuyruktan çıktığında diğer süreçlere bildirim (transaction içinde)."""
+    _notify(session, {"op": "remove", "restaurant_id": restaurant_id, "order_id": order_id})
+
+
+def _notify(session, event: dict):
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    event["origin"] = process_origin()
+    payload = json.dumps(event)
+    if len(payload.encode()) > _MAX_PAYLOAD:
+        payload = json.dumps({
+            "op": "reload", "restaurant_id": event["restaurant_id"], "origin": event["origin"]
+        })
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": NOTIFY_CHANNEL, "payload": payload},
+    )
@@ -3,9 +3,10 @@ Ortak MCP tool fonksiyonlarının saf Python implementasyonu.
 
 Bu modül, herhangi bir MCP kütüphanesine bağımlı değildir.
 Hem Flask uygulaması içinde, hem de MCP server içinde import edilerek kullanılabilir.
-"""
 
-import requests
+`requests` sadece onerilen_menu çağrıldığında import edilir; böylece sadece
+tahmini_bekleme_suresi'ni kullanan süreçler HTTP istemcisini yüklemez.
+"""
 
 
 def tahmini_bekleme_suresi(
@@ -64,6 +65,8 @@ def onerilen_menu(ana_malzeme: str = "chicken") -> dict:
       - yemek_id
       - gorsel_url
     """
+    import requests
+
     url = f"https://www.themealdb.com/api/json/v1/1/filter.php?i={ana_malzeme}"
 
     try:
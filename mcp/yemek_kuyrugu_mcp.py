@@ -3,20 +3,66 @@ Yemek Kuyruğu MCP Servisi
 
 Bu dosya, Model Context Protocol (MCP) ile çalışan bir servis örneğidir.
 Servis, yemek kuyruğu projesi ile mantıksal olarak ilişkilidir ve
-aşağıdaki iki tool fonksiyonunu sağlar:
+aşağıdaki tool fonksiyonlarını sağlar:
 
 - tahmini_bekleme_suresi_tool: Kuyruktaki sipariş sayısına göre tahmini bekleme süresi hesabı
 - onerilen_menu_tool: Public bir yemek API'sinden (TheMealDB) örnek yemek önerisi çeker
+- kuyruk_derinligi_tool: Restoranın canlı kuyruğundaki sipariş sayısı (veritabanından)
+- siparis_durumu_tool: Sipariş durumu ve geçmişi (veritabanından)
+- toplu_bekleme_tahmini_tool: Birden fazla restoran için tahmini bekleme süresi
 
 Bu dosya, projeden bağımsız bir süreç olarak çalışır ve LLM istemcileri
-tarafından MCP server olarak kullanılabilir.
+tarafından MCP server olarak kullanılabilir. Veritabanı tool'ları Flask
+API'sine gitmeden Postgres'i paylaşılan bir connection pool üzerinden okur.
+
+Transport MCP_TRANSPORT ile seçilir:
+  - stdio (varsayılan): tek istemci, komut satırından başlatılır
+  - streamable-http: MCP_HOST:MCP_PORT üzerinde çok sayıda eşzamanlı istemci
+
+Proje kökünden script olarak çalıştırılır:
+
+    python mcp/yemek_kuyrugu_mcp.py
+
+"python -m mcp.yemek_kuyrugu_mcp" kullanılamaz: o durumda yerel mcp/ klasörü
+pip'teki mcp paketini gölgeler ve mcp.server import edilemez.
 """
 
+import importlib
+import os
+import sys
+
+if not __package__:
+    # Script olarak çalışırken sys.path[0] bu klasördür, yani "mcp" pip paketine
+    # çözülür. Kardeş modüller (tools, db_tools) üst düzey modül olarak yüklenir;
+    # db_tools'un kullandığı live_queue / sharding için proje kökü sys.path'in
+    # sonuna eklenir (pip paketlerinden sonra, mcp'yi gölgelemez).
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import anyio
 from mcp.server.fastmcp import FastMCP
-from .tools import tahmini_bekleme_suresi, onerilen_menu
+
+if __package__:
+    from .tools import tahmini_bekleme_suresi, onerilen_menu
+else:
+    from tools import tahmini_bekleme_suresi, onerilen_menu
+
+
+def _db_tools():
+    """mcp.db_tools (veya script modunda db_tools) modülünü ilk çağrıda import eder."""
+    if __package__:
+        return importlib.import_module(".db_tools", __package__)
+    return importlib.import_module("db_tools")
 
 # MCP sunucusunu oluştur
-mcp = FastMCP("Yemek Kuyrugu MCP", json_response=True)
+# stateless_http: her HTTP isteği bağımsız işlenir, istemci başına oturum
+# durumu tutulmaz; çok sayıda ajan aynı süreci paylaşabilir.
+mcp = FastMCP(
+    "Yemek Kuyrugu MCP",
+    json_response=True,
+    stateless_http=True,
+    host=os.getenv("MCP_HOST", "127.0.0.1"),
+    port=int(os.getenv("MCP_PORT", "8000")),
+)
 
 
 @mcp.tool()
@@ -45,7 +91,45 @@ def onerilen_menu_tool(ana_malzeme: str = "chicken") -> dict:
     return onerilen_menu(ana_malzeme)
 
 
+# Veritabanı tool'ları bloklayan I/O yapar; event loop'u tutmamaları için
+# thread pool'da çalıştırılır, böylece HTTP transport'ta istemciler birbirini beklemez.
+# mcp.db_tools (SQLAlchemy, canlı kuyruk) ilk çağrıda import edilir; sadece
+# hesaplama tool'larını kullanan istemciler için sunucu daha hızlı açılır.
+
+@mcp.tool()
+async def kuyruk_derinligi_tool(restaurant_id: int) -> dict:
+    """
+    MCP tool sarmalayıcısı:
+    Asıl iş mantığı mcp.db_tools.kuyruk_derinligi fonksiyonunda.
+    """
+    return await anyio.to_thread.run_sync(_db_tools().kuyruk_derinligi, restaurant_id)
+
+
+@mcp.tool()
+async def siparis_durumu_tool(order_id: str) -> dict:
+    """
+    MCP tool sarmalayıcısı:
+    Asıl iş mantığı mcp.db_tools.siparis_durumu fonksiyonunda.
+    """
+    return await anyio.to_thread.run_sync(_db_tools().siparis_durumu, order_id)
+
+
+@mcp.tool()
+async def toplu_bekleme_tahmini_tool(
+    restaurant_ids: list[int],
+    ort_hazirlama_suresi_dk: int = 8,
+    paralel_mutfak_sayisi: int = 1,
+) -> dict:
+    """
+    MCP tool sarmalayıcısı:
+    Asıl iş mantığı mcp.db_tools.toplu_bekleme_tahmini fonksiyonunda.
+    """
+    return await anyio.to_thread.run_sync(
+        _db_tools().toplu_bekleme_tahmini, restaurant_ids, ort_hazirlama_suresi_dk, paralel_mutfak_sayisi
+    )
+
+
 if __name__ == "__main__":
-    # Derste genelde stdio veya http kullanılıyor; burada stdio seçtik.
-    # MCP client'lar bunu stdio üzerinden bağlayabilir.
-    mcp.run(transport="stdio")
+    # Varsayılan stdio: MCP client'lar bunu komut olarak başlatıp bağlanabilir.
+    # MCP_TRANSPORT=streamable-http ile çok istemcili HTTP sunucusu olarak çalışır.
+    mcp.run(transport=os.getenv("MCP_TRANSPORT", "stdio"))
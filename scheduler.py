@@ -0,0 +1,264 @@
+"""
+Bekleyen siparişler için zamanlayıcı.
+
+Siparişlerin takip işleri (ör. restoranın süresinde onaylamadığı siparişi
+otomatik reddetmek) insan değil arka plan işçisi tarafından yapıldığında
+hangi işin ne zaman ve hangi sırayla yapılacağına bu modül karar verir.
+
+İki katman var:
+
+1. Zaman: Tüm görevler due zamanına göre bir min-heap'te tutulur.
+   Ekleme / en yakın görevi alma O(log n); iptal, görevi "ölü" işaretleyip
+   heap'ten tembel (lazy) silme ile O(1). Ölü kayıtlar heap'in yarısını
+   geçince heap sıkıştırılır.
+
+2. Adalet: Zamanı gelmiş görevler restaurant_id bazında kuyruklara alınır
+   ve ağırlıklı adil sıralama (WFQ benzeri sanal zaman) ile işlenir. Her
+   restoranın sanal zamanı, işlenen her görevde 1/ağırlık kadar ilerler;
+   her adımda sanal zamanı en küçük restoran seçilir. Böylece binlerce
+   gecikmiş siparişi olan tek bir restoran diğerlerini aç bırakmaz.
+
+Handler hata verirse (ör. geçici veritabanı hatası) görev kaybolmaz;
+üstel artan bir gecikmeyle yeniden kurulur. Handler'lar bu yüzden tekrar
+çalıştırılmaya dayanıklı (idempotent) olmalıdır.
+"""
+
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Task:
+    __slots__ = ("kind", "key", "restaurant_id", "due", "alive", "attempts")
+
+    def __init__(self, kind: str, key, restaurant_id: int, due: float, attempts: int = 0):
+        self.kind = kind
+        self.key = key
+        self.restaurant_id = restaurant_id
+        self.due = due
+        self.alive = True
+        self.attempts = attempts
+
+
+class DeadlineScheduler:
+    """
+    Due zamanına göre sıralı, restoranlar arasında ağırlıklı adil zamanlayıcı.
+
+    Parametreler:
+      - handlers: kind -> handler(task) eşlemesi
+      - batch_size: Bir turda en fazla işlenecek görev (sonra zamanlar yeniden kontrol edilir)
+      - clock: Zaman kaynağı (varsayılan time.time; due değerleri aynı birimde olmalı)
+      - retry_delay_s: Hata veren görevin ilk yeniden deneme gecikmesi (her denemede iki katı)
+      - max_retry_delay_s: Yeniden deneme gecikmesinin üst sınırı
+    """
+
+    def __init__(self, handlers: dict, batch_size: int = 100, clock=time.time,
+                 retry_delay_s: float = 5.0, max_retry_delay_s: float = 300.0):
+        if batch_size < 1:
+            raise ValueError("batch_size en az 1 olmalı")
+        if retry_delay_s <= 0 or max_retry_delay_s < retry_delay_s:
+            raise ValueError("retry_delay_s pozitif ve max_retry_delay_s'ten küçük olmalı")
+
+        self._handlers = dict(handlers)
+        self.batch_size = batch_size
+        self._clock = clock
+        self.retry_delay_s = retry_delay_s
+        self.max_retry_delay_s = max_retry_delay_s
+
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._timers: list = []          # (due, seq, Task)
+        self._tasks: dict = {}           # (kind, key) -> Task
+        self._dead = 0
+
+        self._weights: dict[int, float] = {}
+        self._vtime: dict[int, float] = {}
+        self._ready: dict[int, list] = {}   # restaurant_id -> [(due, seq, Task)] (heap)
+        self._fair: list = []               # (vtime, restaurant_id)
+        self._global_vtime = 0.0
+
+        self._thread = None
+        self._pid = None
+        self._stopped = False
+
+    # ----------------------------
+    #  Görev yönetimi
+    # ----------------------------
+
+    def schedule(self, kind: str, key, restaurant_id: int, due: float):
+        """Görevi ekler; aynı (kind, key) varsa due zamanı güncellenir."""
+        with self._cond:
+            self._cancel_locked(kind, key)
+            self._push_locked(Task(kind, key, restaurant_id, due))
+
+    def _push_locked(self, task: Task):
+        self._tasks[(task.kind, task.key)] = task
+        heapq.heappush(self._timers, (task.due, next(self._seq), task))
+        if self._timers[0][2] is task:
+            self._cond.notify()
+
+    def _retry(self, task: Task, now: float):
+        """Hata veren görevi geri çekilmeli (backoff) olarak yeniden kurar."""
+        delay = min(self.retry_delay_s * 2 ** task.attempts, self.max_retry_delay_s)
+        with self._cond:
+            # Bu arada aynı görev yeniden kurulduysa yenisi geçerlidir.
+            if (task.kind, task.key) in self._tasks:
+                return
+            self._push_locked(
+                Task(task.kind, task.key, task.restaurant_id, now + delay, task.attempts + 1)
+            )
+        logger.warning("%s görevi %.0f sn sonra yeniden denenecek: %s", task.kind, delay, task.key)
+
+    def cancel(self, kind: str, key) -> bool:
+        with self._cond:
+            return self._cancel_locked(kind, key)
+
+    def set_weight(self, restaurant_id: int, weight: float):
+        """Restoranın payı; 2 ağırlıklı restoran, 1 ağırlıklıya göre iki kat görev alır."""
+        if weight <= 0:
+            raise ValueError("weight pozitif olmalı")
+        with self._cond:
+            self._weights[restaurant_id] = weight
+
+    def __len__(self):
+        with self._cond:
+            return len(self._tasks)
+
+    def _cancel_locked(self, kind, key) -> bool:
+        task = self._tasks.pop((kind, key), None)
+        if task is None:
+            return False
+        task.alive = False
+        self._dead += 1
+        if self._dead > 1024 and self._dead > len(self._timers) // 2:
+            self._compact_locked()
+        return True
+
+    def _compact_locked(self):
+        self._timers = [e for e in self._timers if e[2].alive]
+        heapq.heapify(self._timers)
+        for rid, ready in list(self._ready.items()):
+            alive = [e for e in ready if e[2].alive]
+            heapq.heapify(alive)
+            self._ready[rid] = alive
+        self._dead = 0
+
+    # ----------------------------
+    #  Sıralama
+    # ----------------------------
+
+    def _promote_due_locked(self, now: float):
+        """Zamanı gelmiş görevleri restoran kuyruklarına taşır."""
+        while self._timers and self._timers[0][0] <= now:
+            entry = heapq.heappop(self._timers)
+            task = entry[2]
+            if not task.alive:
+                self._dead -= 1
+                continue
+            rid = task.restaurant_id
+            ready = self._ready.get(rid)
+            if ready is None:
+                ready = self._ready[rid] = []
+                # Boşta kalan restoran biriktirdiği payla öne geçmesin.
+                vtime = max(self._vtime.get(rid, 0.0), self._global_vtime)
+                self._vtime[rid] = vtime
+                heapq.heappush(self._fair, (vtime, rid))
+            heapq.heappush(ready, entry)
+
+    def next_batch(self, now: float | None = None, limit: int | None = None) -> list[Task]:
+        """
+        Zamanı gelmiş görevlerden en fazla limit tanesini adil sırayla
+        kuyruktan çıkarır ve döner.
+        """
+        now = self._clock() if now is None else now
+        limit = self.batch_size if limit is None else limit
+        batch = []
+        with self._cond:
+            self._promote_due_locked(now)
+            while self._fair and len(batch) < limit:
+                vtime, rid = heapq.heappop(self._fair)
+                ready = self._ready.get(rid)
+                if ready is None:
+                    continue
+                task = None
+                while ready:
+                    candidate = heapq.heappop(ready)[2]
+                    if candidate.alive:
+                        task = candidate
+                        break
+                    self._dead -= 1
+
+                if task is not None:
+                    del self._tasks[(task.kind, task.key)]
+                    task.alive = False
+                    batch.append(task)
+                    self._global_vtime = vtime
+                    vtime += 1.0 / self._weights.get(rid, 1.0)
+                self._vtime[rid] = vtime
+
+                if ready:
+                    heapq.heappush(self._fair, (vtime, rid))
+                else:
+                    del self._ready[rid]
+        return batch
+
+    def _next_due_locked(self):
+        while self._timers and not self._timers[0][2].alive:
+            heapq.heappop(self._timers)
+            self._dead -= 1
+        return self._timers[0][0] if self._timers else None
+
+    # ----------------------------
+    #  İşçi thread'i
+    # ----------------------------
+
+    def start(self):
+        """İşçi thread'ini başlatır (fork sonrası çağrılırsa yeni süreçte yeniden başlatır)."""
+        with self._cond:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._loop, name="deadline-scheduler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def run_pending(self, now: float | None = None) -> int:
+        """Zamanı gelmiş bir batch'i işler; işlenen görev sayısını döner."""
+        now = self._clock() if now is None else now
+        batch = self.next_batch(now)
+        for task in batch:
+            handler = self._handlers.get(task.kind)
+            if handler is None:
+                continue
+            try:
+                handler(task)
+            except Exception:
+                # Tek bir görevin hatası zamanlayıcıyı durdurmasın; görev de
+                # kaybolmasın (ör. geçici veritabanı hatası), yeniden denenir.
+                logger.exception("%s görevi işlenemedi: %s", task.kind, task.key)
+                self._retry(task, now)
+        return len(batch)
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                due = self._next_due_locked()
+                now = self._clock()
+                if not self._ready and (due is None or due > now):
+                    self._cond.wait(timeout=None if due is None else due - now)
+                    continue
+            self.run_pending()
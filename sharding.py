@@ -0,0 +1,547 @@
+"""
+Siparişlerin restaurant_id'ye göre birden fazla Postgres veritabanına dağıtılması.
+
+Sıcak sorguların neredeyse hepsi tek bir restoranla sınırlı olduğu için
+orders tablosu restaurant_id ile shard'lanır; users ve restaurants ana
+veritabanında kalır.
+
+- HashRing: restaurant_id -> shard adı, sanal düğümlü consistent hashing.
+  Shard eklemek / çıkarmak restoranların sadece küçük bir kısmını taşır.
+- ShardRouter: halka + taşınmış restoranlar için override tablosu
+  (yemek_kuyrugu.shard_overrides, ana veritabanında) + shard engine'leri.
+  Kullanıcı bazlı sorgular için tüm shard'lara paralel sorgu (scatter) yapar.
+- move_restaurant: bir restoranın siparişlerini başka bir shard'a taşır;
+  taşıma sırasında restoranın yazmaları durdurulur (ShardMoving).
+- pin_owners / rebalance: shard eklerken restoranları önce mevcut
+  shard'larına sabitler, sonra halkanın yeni sahibine tek tek taşır.
+
+Ayar formatı (SHARD_DATABASE_URLS):
+
+    "default,s1=postgresql+psycopg2://...,s2=postgresql+psycopg2://..."
+
+"default" adı ana veritabanını (uygulamanın kendi engine'i) ifade eder.
+Ayar boşsa tek shard ("default") vardır ve davranış shard'sız hali ile aynıdır.
+"default" listede yoksa ana veritabanındaki siparişler görünmez olacağından
+ayar reddedilir (bilinçli bir geçiş için allow_missing_default=True).
+
+Shard ekleme:
+
+  1. Eski ayarla: flask pin-shard-owners  (tüm restoranlar mevcut shard'ına sabitlenir)
+  2. Yeni shard'ı SHARD_DATABASE_URLS'e ekleyip uygulamayı yeniden başlat;
+     sabitlemeler sayesinde hiçbir restoranın yönlendirmesi değişmez
+  3. Yeni ayarla: flask rebalance-shards [--dry-run]
+     (halkaya göre yeri değişen restoranlar tek tek taşınır, diğerlerinin
+     sabitlemesi kaldırılır)
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import text
+
+DEFAULT_SHARD = "default"
+
+_ORDER_COLUMNS = (
+    "id, user_id, restaurant_id, amount, items, status, transaction_id, "
+    "created_at, last_updated_at, status_history"
+)
+
+
+class ShardMoving(Exception):
+    """Restoran başka bir shard'a taşınırken yazma yapılmak istendiğinde fırlatılır."""
+
+    def __init__(self, restaurant_id: int):
+        super().__init__(restaurant_id)
+        self.restaurant_id = restaurant_id
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Sanal düğümlü consistent-hash halkası."""
+
+    def __init__(self, nodes: list[str], vnodes: int = 64):
+        if not nodes:
+            raise ValueError("En az bir shard gerekli")
+        if vnodes < 1:
+            raise ValueError("vnodes en az 1 olmalı")
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in nodes for i in range(vnodes)
+        )
+        self._keys = [p[0] for p in points]
+        self._nodes = [p[1] for p in points]
+
+    def node_for(self, key) -> str:
+        i = bisect.bisect(self._keys, _hash(str(key)))
+        return self._nodes[i % len(self._nodes)]
+
+
+def parse_shard_urls(raw: str, allow_missing_default: bool = False) -> dict[str, str | None]:
+    """"default,s1=url,..." -> {"default": None, "s1": "url"} (None = ana veritabanı)."""
+    shards: dict[str, str | None] = {}
+    for part in filter(None, (p.strip() for p in raw.split(","))):
+        name, _, url = part.partition("=")
+        name = name.strip()
+        if name in shards:
+            raise ValueError(f"Shard adı tekrar ediyor: {name}")
+        if not url and name != DEFAULT_SHARD:
+            raise ValueError(f"{name} shard'ı için veritabanı adresi verilmedi")
+        shards[name] = url.strip() or None
+    if shards and DEFAULT_SHARD not in shards and not allow_missing_default:
+        raise ValueError(
+            f'SHARD_DATABASE_URLS "{DEFAULT_SHARD}" shard\'ını içermiyor; ana veritabanındaki '
+            "siparişler görünmez olur (bilinçli bir geçişse SHARD_ALLOW_NO_DEFAULT=1)"
+        )
+    return shards or {DEFAULT_SHARD: None}
+
+
+class ShardRouter:
+    """
+    restaurant_id -> shard yönlendirmesi.
+
+    Parametreler:
+      - engines: shard adı -> SQLAlchemy engine
+      - main_engine: shard_overrides tablosunun bulunduğu ana veritabanı
+      - vnodes: Halkada shard başına sanal düğüm sayısı
+      - override_ttl_s: Override tablosunun yeniden okunma aralığı
+    """
+
+    def __init__(self, engines: dict, main_engine, vnodes: int = 64, override_ttl_s: float = 5.0):
+        self.engines = dict(engines)
+        self.names = list(self.engines)
+        self.main_engine = main_engine
+        self.ring = HashRing(self.names, vnodes)
+        self.override_ttl_s = override_ttl_s
+
+        self._overrides: dict[int, str] = {}
+        self._moving: frozenset[int] = frozenset()
+        self._overrides_loaded_at = float("-inf")
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_pid = None
+
+    @property
+    def sharded(self) -> bool:
+        return len(self.names) > 1
+
+    def engine(self, name: str):
+        return self.engines[name]
+
+    def shard_for(self, restaurant_id: int) -> str:
+        if not self.sharded:
+            return self.names[0]
+        override = self._current_overrides().get(int(restaurant_id))
+        if override in self.engines:
+            return override
+        return self.ring.node_for(int(restaurant_id))
+
+    def write_shard_for(self, restaurant_id: int) -> str:
+        """
+        Yazmalar için shard. Restoran taşınıyorsa ShardMoving fırlatılır;
+        çağıran isteği reddeder (ör. 503) veya sonra yeniden dener.
+        """
+        shard = self.shard_for(restaurant_id)
+        if self.sharded and int(restaurant_id) in self._moving:
+            raise ShardMoving(restaurant_id)
+        return shard
+
+    def _current_overrides(self) -> dict[int, str]:
+        if time.monotonic() - self._overrides_loaded_at >= self.override_ttl_s:
+            with self._lock:
+                if time.monotonic() - self._overrides_loaded_at >= self.override_ttl_s:
+                    self._overrides, self._moving = load_overrides(self.main_engine)
+                    self._overrides_loaded_at = time.monotonic()
+        return self._overrides
+
+    def invalidate_overrides(self):
+        self._overrides_loaded_at = float("-inf")
+
+    def map(self, fn) -> dict:
+        """fn(shard_adı)'nı her shard için paralel çalıştırır; shard adı -> sonuç döner."""
+        if not self.sharded:
+            return {self.names[0]: fn(self.names[0])}
+        # fork sonrası ebeveynin thread pool'u çocukta çalışmaz; süreç başına kurulur.
+        if self._pool is None or self._pool_pid != os.getpid():
+            with self._lock:
+                if self._pool is None or self._pool_pid != os.getpid():
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=len(self.names), thread_name_prefix="shard-scatter"
+                    )
+                    self._pool_pid = os.getpid()
+        futures = {name: self._pool.submit(fn, name) for name in self.names}
+        return {name: fut.result() for name, fut in futures.items()}
+
+
+def build_router(main_engine, raw_urls: str, vnodes: int = 64,
+                 override_ttl_s: float = 5.0, engine_factory=None,
+                 allow_missing_default: bool = False) -> ShardRouter:
+    """
+    SHARD_DATABASE_URLS değerinden router kurar. "default" shard'ı main_engine'i
+    kullanır; diğerleri için engine_factory(url) (varsayılan create_engine) çağrılır.
+    """
+    if engine_factory is None:
+        from sqlalchemy import create_engine as engine_factory
+
+    urls = parse_shard_urls(raw_urls, allow_missing_default=allow_missing_default)
+    engines = {
+        name: main_engine if url is None else engine_factory(url)
+        for name, url in urls.items()
+    }
+    return ShardRouter(engines, main_engine, vnodes=vnodes, override_ttl_s=override_ttl_s)
+
+
+# ============================
+#  OVERRIDE TABLOSU
+# ============================
+
+def load_overrides(engine) -> tuple[dict[int, str], frozenset[int]]:
+    """(restaurant_id -> shard, taşınmakta olan restaurant_id'ler) döner."""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT restaurant_id, shard, moving FROM yemek_kuyrugu.shard_overrides")
+        ).all()
+    return (
+        {r.restaurant_id: r.shard for r in rows},
+        frozenset(r.restaurant_id for r in rows if r.moving),
+    )
+
+
+def save_override(engine, restaurant_id: int, shard: str, moving: bool = False):
+    """Elle yerleştirme (pinned=False): rebalance bu restorana dokunmaz."""
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO yemek_kuyrugu.shard_overrides (restaurant_id, shard, moving) "
+                "VALUES (:restaurant_id, :shard, :moving) "
+                "ON CONFLICT (restaurant_id) DO UPDATE "
+                "SET shard = EXCLUDED.shard, moving = EXCLUDED.moving, "
+                "pinned = FALSE, updated_at = NOW()"
+            ),
+            {"restaurant_id": restaurant_id, "shard": shard, "moving": moving},
+        )
+
+
+def load_pins(engine) -> dict[int, str]:
+    """pin_owners ile sabitlenmiş (taşınmayı bekleyen) restoranlar -> shard."""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text(
+                "SELECT restaurant_id, shard FROM yemek_kuyrugu.shard_overrides "
+                "WHERE pinned AND NOT moving"
+            )
+        ).all()
+    return {r.restaurant_id: r.shard for r in rows}
+
+
+def delete_override(engine, restaurant_id: int):
+    with engine.begin() as conn:
+        conn.execute(
+            text("DELETE FROM yemek_kuyrugu.shard_overrides WHERE restaurant_id = :restaurant_id"),
+            {"restaurant_id": restaurant_id},
+        )
+
+
+# ============================
+#  REBALANCING
+# ============================
+
+def _copy_orders(source, target, restaurant_id: int, batch_size: int) -> int:
+    """
+    Restoranın siparişlerini kaynaktan hedefe upsert eder. Hedefteki kayıt
+    daha yeniyse (last_updated_at) üzerine yazılmaz. Kopyalanan satır sayısını döner.
+    """
+    copied = 0
+    last_id = ""
+    while True:
+        with source.connect() as conn:
+            rows = conn.execute(
+                text(
+                    f"SELECT {_ORDER_COLUMNS} FROM yemek_kuyrugu.orders "
+                    "WHERE restaurant_id = :restaurant_id AND id > :last_id "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"restaurant_id": restaurant_id, "last_id": last_id, "limit": batch_size},
+            ).mappings().all()
+        if not rows:
+            return copied
+
+        with target.begin() as conn:
+            conn.execute(
+                text(
+                    f"INSERT INTO yemek_kuyrugu.orders ({_ORDER_COLUMNS}) VALUES ("
+                    ":id, :user_id, :restaurant_id, :amount, CAST(:items AS JSONB), :status, "
+                    ":transaction_id, :created_at, :last_updated_at, CAST(:status_history AS JSONB)) "
+                    "ON CONFLICT (id) DO UPDATE SET "
+                    "status = EXCLUDED.status, "
+                    "last_updated_at = EXCLUDED.last_updated_at, "
+                    "status_history = EXCLUDED.status_history "
+                    "WHERE yemek_kuyrugu.orders.last_updated_at < EXCLUDED.last_updated_at"
+                ),
+                [_jsonb_params(r) for r in rows],
+            )
+        copied += len(rows)
+        last_id = rows[-1]["id"]
+
+
+def _delete_copied(source, target, restaurant_id: int, batch_size: int) -> int:
+    """
+    Kaynaktan sadece hedefe kopyalandığı doğrulanan siparişleri siler: hedefte
+    aynı id ile ve aynı (veya daha yeni) last_updated_at ile bulunan satırlar.
+    Son kopyadan sonra kaynağa düşen / kaynakta güncellenen satırlara dokunulmaz.
+    Silinen satır sayısını döner.
+    """
+    deleted = 0
+    last_id = ""
+    while True:
+        with target.connect() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT id, last_updated_at FROM yemek_kuyrugu.orders "
+                    "WHERE restaurant_id = :restaurant_id AND id > :last_id "
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"restaurant_id": restaurant_id, "last_id": last_id, "limit": batch_size},
+            ).all()
+        if not rows:
+            return deleted
+
+        with source.begin() as conn:
+            deleted += conn.execute(
+                text(
+                    "DELETE FROM yemek_kuyrugu.orders o "
+                    "USING unnest(CAST(:ids AS TEXT[]), CAST(:stamps AS TIMESTAMPTZ[])) "
+                    "AS t(id, last_updated_at) "
+                    "WHERE o.id = t.id AND o.restaurant_id = :restaurant_id "
+                    "AND o.last_updated_at <= t.last_updated_at"
+                ),
+                {
+                    "restaurant_id": restaurant_id,
+                    "ids": [r.id for r in rows],
+                    "stamps": [r.last_updated_at for r in rows],
+                },
+            ).rowcount
+        last_id = rows[-1].id
+
+
+def _count_orders(engine, restaurant_id: int) -> int:
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT COUNT(*) FROM yemek_kuyrugu.orders WHERE restaurant_id = :restaurant_id"),
+            {"restaurant_id": restaurant_id},
+        ).scalar_one()
+
+
+def _jsonb_params(row) -> dict:
+    params = dict(row)
+    params["items"] = json.dumps(params["items"])
+    params["status_history"] = json.dumps(params["status_history"])
+    return params
+
+
+def move_restaurant(router: ShardRouter, restaurant_id: int, target: str,
+                    grace_s: float | None = None, batch_size: int = 1000,
+                    source: str | None = None, log=print) -> dict:
+    """
+    Restoranı başka bir shard'a taşır:
+
+      1. Tüm siparişleri hedefe kopyala (upsert); bu sırada yazmalar sürer
+      2. Override'ı "moving" olarak yaz: okumalar kaynakta kalır, yazmalar
+         (sipariş oluşturma, onay / red / iptal) ShardMoving ile reddedilir
+      3. grace_s bekle (varsayılan: router.override_ttl_s + 1): tüm süreçler
+         moving durumunu görür, öncesinde başlamış yazmalar biter
+      4. Yazmalar durmuşken son farkı kopyala
+      5. Override'ı hedefe çevir (moving kapanır): yazmalar hedefe gider
+      6. Eski override'ı görmekte olan okuyucular için grace_s bekle
+      7. Kaynaktan sadece hedefte doğrulanan siparişleri sil
+
+    Yazmalar 2-5 arasında (en az grace_s + son kopya süresi) durur. Aynı
+    siparişe iki shard'da ayrı ayrı geçiş yapılamaz; aksi halde bir sonraki
+    kopya, müşteriye "başarılı" denmiş bir geçişi sessizce ezebilirdi.
+    Hedefte doğrulanamayan satırlar silinmez, "remaining" ile bildirilir;
+    taşıma source=<eski shard> ile tekrar çalıştırılarak tamamlanabilir.
+    """
+    if target not in router.engines:
+        raise ValueError(f"Bilinmeyen shard: {target}")
+    if source is None:
+        source = router.shard_for(restaurant_id)
+    elif source not in router.engines:
+        raise ValueError(f"Bilinmeyen shard: {source}")
+    if source == target:
+        return {
+            "restaurant_id": restaurant_id, "source": source, "target": target,
+            "copied": 0, "deleted": 0, "remaining": 0,
+        }
+
+    src_engine, dst_engine = router.engine(source), router.engine(target)
+    grace_s = router.override_ttl_s + 1 if grace_s is None else grace_s
+
+    copied = _copy_orders(src_engine, dst_engine, restaurant_id, batch_size)
+    log(f"{copied} sipariş {source} -> {target} kopyalandı")
+
+    save_override(router.main_engine, restaurant_id, source, moving=True)
+    router.invalidate_overrides()
+    try:
+        log(f"yazmalar durduruldu, {grace_s:.0f} sn bekleniyor")
+        time.sleep(grace_s)
+        copied += _copy_orders(src_engine, dst_engine, restaurant_id, batch_size)
+    except BaseException:
+        # Taşıma yarıda kaldı: restoran kaynakta yazılabilir hale döner.
+        save_override(router.main_engine, restaurant_id, source)
+        router.invalidate_overrides()
+        raise
+
+    save_override(router.main_engine, restaurant_id, target)
+    router.invalidate_overrides()
+    log(f"override {target} olarak yazıldı, {grace_s:.0f} sn bekleniyor")
+    time.sleep(grace_s)
+
+    deleted = _delete_copied(src_engine, dst_engine, restaurant_id, batch_size)
+    remaining = _count_orders(src_engine, restaurant_id)
+    log(f"{deleted} sipariş {source} shard'ından silindi")
+    if remaining:
+        log(f"UYARI: {source} shard'ında {remaining} sipariş kaldı (silinmedi); "
+            f"taşımayı --source {source} ile tekrar çalıştırın")
+
+    return {
+        "restaurant_id": restaurant_id,
+        "source": source,
+        "target": target,
+        "copied": copied,
+        "deleted": deleted,
+        "remaining": remaining,
+    }
+
+
+def _known_restaurant_ids(router: ShardRouter) -> set[int]:
+    """restaurants tablosu + herhangi bir shard'da siparişi olan restaurant_id'ler."""
+    with router.main_engine.connect() as conn:
+        ids = set(conn.execute(text("SELECT id FROM yemek_kuyrugu.restaurants")).scalars())
+    for row in find_in_shards(
+        router, "SELECT DISTINCT restaurant_id FROM yemek_kuyrugu.orders", {}
+    ):
+        ids.add(row.restaurant_id)
+    return ids
+
+
+def pin_owners(router: ShardRouter, batch_size: int = 1000, log=print) -> int:
+    """
+    Shard eklemeden önce (eski ayarla) çalıştırılır: bilinen tüm restoranları
+    şu anki shard'larına sabitler (pinned override). Halka değiştiğinde
+    sabitlenmiş restoranların yönlendirmesi değişmez; rebalance bunları
+    yeni sahiplerine taşır. Override'ı olan restoranlara dokunulmaz.
+    Yeni sabitlenen restoran sayısını döner.
+    """
+    ids = sorted(_known_restaurant_ids(router))
+    pinned = 0
+    for start in range(0, len(ids), batch_size):
+        rows = [
+            {"restaurant_id": rid, "shard": router.shard_for(rid)}
+            for rid in ids[start:start + batch_size]
+        ]
+        with router.main_engine.begin() as conn:
+            pinned += conn.execute(
+                text(
+                    "INSERT INTO yemek_kuyrugu.shard_overrides (restaurant_id, shard, pinned) "
+                    "SELECT restaurant_id, shard, TRUE FROM unnest("
+                    "CAST(:ids AS INTEGER[]), CAST(:shards AS TEXT[])) AS t(restaurant_id, shard) "
+                    "ON CONFLICT (restaurant_id) DO NOTHING"
+                ),
+                {
+                    "ids": [r["restaurant_id"] for r in rows],
+                    "shards": [r["shard"] for r in rows],
+                },
+            ).rowcount
+    router.invalidate_overrides()
+    log(f"{pinned} restoran mevcut shard'ına sabitlendi ({len(ids)} restoran)")
+    return pinned
+
+
+def rebalance(router: ShardRouter, grace_s: float | None = None, batch_size: int = 1000,
+              dry_run: bool = False, log=print) -> dict:
+    """
+    Shard ekledikten sonra (yeni ayarla) çalıştırılır. Sabitlenmiş her
+    restoran için halkanın yeni sahibine bakılır:
+
+      - sahibi değişmemişse sabitleme kaldırılır (yönlendirme aynı kalır)
+      - değişmişse restoran move_restaurant ile tek tek taşınır, sonra
+        override kaldırılır (halka zaten hedefi gösterir)
+
+    dry_run=True ise hiçbir şey değiştirilmez; taşınacak restoranlar döner.
+    Elle taşınmış (move-restaurant) restoranlara dokunulmaz.
+    """
+    pins = load_pins(router.main_engine)
+    moves, unpin, unknown = {}, [], []
+    for rid, shard in sorted(pins.items()):
+        if shard not in router.engines:
+            unknown.append(rid)
+        elif router.ring.node_for(rid) == shard:
+            unpin.append(rid)
+        else:
+            moves[rid] = (shard, router.ring.node_for(rid))
+
+    for rid in unknown:
+        log(f"UYARI: restoran {rid} ayarda olmayan shard'a sabitli: {pins[rid]}")
+    for rid, (source, target) in moves.items():
+        log(f"restoran {rid}: {source} -> {target}")
+    misplaced = find_misplaced(router, skip=pins)
+    for rid, shards in misplaced.items():
+        log(f"UYARI: restoran {rid} siparişleri yönlendirilmediği shard'da: {', '.join(shards)} "
+            f"(sabitlenmemiş; move-restaurant --source ile taşıyın)")
+    result = {
+        "moved": list(moves), "unpinned": unpin, "unknown": unknown,
+        "misplaced": misplaced, "failed": [],
+    }
+    if dry_run:
+        return result
+
+    for rid in unpin:
+        delete_override(router.main_engine, rid)
+    router.invalidate_overrides()
+    log(f"{len(unpin)} restoranın sabitlemesi kaldırıldı, {len(moves)} restoran taşınacak")
+
+    for rid, (source, target) in moves.items():
+        moved = move_restaurant(router, rid, target, grace_s=grace_s,
+                                batch_size=batch_size, source=source, log=log)
+        if moved["remaining"]:
+            result["failed"].append(rid)
+            continue
+        delete_override(router.main_engine, rid)
+        router.invalidate_overrides()
+    return result
+
+
+def find_misplaced(router: ShardRouter, skip=()) -> dict[int, list[str]]:
+    """
+    Siparişleri, şu an yönlendirildiği shard dışında bir shard'da bulunan
+    restoranlar (ör. sabitlenmeden halka değişmişse): restaurant_id -> shard'lar.
+    """
+    stmt = text("SELECT DISTINCT restaurant_id FROM yemek_kuyrugu.orders")
+
+    def run(name):
+        with router.engine(name).connect() as conn:
+            return conn.execute(stmt).scalars().all()
+
+    misplaced: dict[int, list[str]] = {}
+    for name, ids in router.map(run).items():
+        for rid in ids:
+            if rid not in skip and router.shard_for(rid) != name:
+                misplaced.setdefault(rid, []).append(name)
+    return misplaced
+
+
+def find_in_shards(router: ShardRouter, sql: str, params: dict):
+    """Ham SQL'i tüm shard'larda paralel çalıştırır, satırları birleştirip döner."""
+    stmt = text(sql)
+
+    def run(name):
+        with router.engine(name).connect() as conn:
+            return conn.execute(stmt, params).all()
+
+    return [row for rows in router.map(run).values() for row in rows]
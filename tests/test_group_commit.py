@@ -0,0 +1,136 @@
+"""
+GroupCommitWriter testleri.
+
+Veritabanı gerekmez: session_scope, savepoint ve commit çağrılarını kaydeden
+sahte bir session üretir.
+"""
+
+import contextlib
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from group_commit import GroupCommitWriter
+
+
+class FakeSession:
+    def __init__(self, fail_commit=False):
+        self.fail_commit = fail_commit
+        self.savepoints = []   # her op için "commit" / "rollback"
+        self.commits = 0
+
+    @contextlib.contextmanager
+    def begin_nested(self):
+        try:
+            yield
+        except Exception:
+            self.savepoints.append("rollback")
+            raise
+        self.savepoints.append("commit")
+
+    def commit(self):
+        if self.fail_commit:
+            raise RuntimeError("commit başarısız")
+        self.commits += 1
+
+
+class FakeScope:
+    def __init__(self, fail_commit=False):
+        self.fail_commit = fail_commit
+        self.sessions = []
+
+    @contextlib.contextmanager
+    def __call__(self):
+        session = FakeSession(self.fail_commit)
+        self.sessions.append(session)
+        yield session
+
+
+def _fail(session):
+    raise ValueError("geçersiz geçiş")
+
+
+def _batch(*ops):
+    return [(op, Future()) for op in ops]
+
+
+def test_failing_op_does_not_fail_the_batch():
+    scope = FakeScope()
+    writer = GroupCommitWriter(scope)
+    batch = _batch(lambda s: 1, _fail, lambda s: 3)
+
+    writer._flush(batch)
+
+    (session,) = scope.sessions
+    assert session.savepoints == ["commit", "rollback", "commit"]
+    assert session.commits == 1
+    assert batch[0][1].result() == 1
+    with pytest.raises(ValueError):
+        batch[1][1].result()
+    assert batch[2][1].result() == 3
+
+
+def test_failed_commit_fails_every_future_in_the_batch():
+    writer = GroupCommitWriter(FakeScope(fail_commit=True))
+    batch = _batch(lambda s: 1, _fail, lambda s: 3)
+
+    writer._flush(batch)
+
+    for _, fut in batch:
+        with pytest.raises(RuntimeError, match="commit"):
+            fut.result()
+
+
+def test_cancelled_future_is_skipped():
+    scope = FakeScope()
+    writer = GroupCommitWriter(scope)
+    batch = _batch(lambda s: 1, lambda s: 2)
+    batch[0][1].cancel()
+
+    writer._flush(batch)
+
+    assert scope.sessions[0].savepoints == ["commit"]
+    assert batch[1][1].result() == 2
+
+
+def test_batch_flushes_at_max_batch_without_waiting_for_window():
+    writer = GroupCommitWriter(FakeScope(), window_ms=10_000, max_batch=3)
+    for i in range(5):
+        writer._queue.put((i, Future()))
+
+    start = time.monotonic()
+    batch = writer._collect()
+
+    assert [op for op, _ in batch] == [0, 1, 2]
+    assert time.monotonic() - start < 1
+    assert writer._queue.qsize() == 2
+
+
+def test_batch_flushes_when_window_ends():
+    writer = GroupCommitWriter(FakeScope(), window_ms=50, max_batch=64)
+    writer._queue.put((0, Future()))
+
+    start = time.monotonic()
+    batch = writer._collect()
+
+    assert len(batch) == 1
+    assert time.monotonic() - start >= 0.05
+
+
+def test_writes_within_window_share_one_commit():
+    scope = FakeScope()
+    writer = GroupCommitWriter(scope, window_ms=200)
+
+    futures = [writer.submit(lambda s, i=i: i) for i in range(5)]
+
+    assert [f.result(timeout=5) for f in futures] == list(range(5))
+    assert len(scope.sessions) == 1
+    assert scope.sessions[0].commits == 1
+
+
+def test_rejects_invalid_parameters():
+    with pytest.raises(ValueError):
+        GroupCommitWriter(FakeScope(), window_ms=-1)
+    with pytest.raises(ValueError):
+        GroupCommitWriter(FakeScope(), max_batch=0)
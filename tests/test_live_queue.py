@@ -0,0 +1,140 @@
+"""
+LiveQueueIndex testleri.
+
+Veritabanı gerekmez: loader, test içindeki satır listesinden okur ve
+LISTEN/NOTIFY yerine apply_event doğrudan çağrılır.
+"""
+
+from live_queue import LiveOrder, LiveQueueIndex, process_origin
+
+
+def _order(order_id, created_at, items=("Pizza",)):
+    return LiveOrder(order_id, 1, 100.0, list(items), created_at)
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def added(self, restaurant_id, order):
+        self.events.append(("added", restaurant_id, order.id))
+
+    def removed(self, restaurant_id, order_id):
+        self.events.append(("removed", restaurant_id, order_id))
+
+
+def _index(rows):
+    """rows: (restaurant_id, LiveOrder) listesi; test sırasında değiştirilebilir."""
+    def loader(restaurant_id=None):
+        return [(rid, o) for rid, o in rows if restaurant_id is None or rid == restaurant_id]
+
+    index = LiveQueueIndex(loader)
+    index.ensure_loaded()
+    return index
+
+
+def _ids(index, restaurant_id):
+    return [o.id for o in index.orders(restaurant_id)]
+
+
+def test_out_of_order_add_resorts_queue():
+    index = _index([(7, _order("a", 10.0))])
+
+    index.add(7, _order("c", 30.0))
+    index.add(7, _order("b", 20.0))
+
+    assert _ids(index, 7) == ["a", "b", "c"]
+    assert index.oldest(7).id == "a"
+
+    index.add(7, _order("z", 5.0))
+    assert _ids(index, 7) == ["z", "a", "b", "c"]
+    assert index.oldest(7).id == "z"
+
+
+def test_add_is_idempotent():
+    index = _index([])
+    sub = Recorder()
+    index.subscribe(sub)
+
+    index.add(7, _order("a", 10.0))
+    index.add(7, _order("a", 10.0))
+
+    assert index.count(7) == 1
+    assert sub.events == [("added", 7, "a")]
+
+
+def test_discard():
+    index = _index([(7, _order("a", 10.0)), (7, _order("b", 20.0))])
+    sub = Recorder()
+    index.subscribe(sub)
+
+    index.discard(7, "a")
+    index.discard(7, "missing")
+    index.discard(99, "a")
+
+    assert _ids(index, 7) == ["b"]
+    assert sub.events == [("removed", 7, "a")]
+
+    index.discard(7, "b")
+    assert index.count(7) == 0
+    assert index.oldest(7) is None
+    assert 7 not in index._queues
+
+
+def test_reload_notifies_subscribers_with_diff():
+    rows = [(7, _order("a", 10.0)), (7, _order("b", 20.0)), (8, _order("c", 30.0))]
+    index = _index(rows)
+    sub = Recorder()
+    index.subscribe(sub)
+
+    rows[:] = [(7, _order("b", 20.0)), (8, _order("c", 30.0)), (8, _order("d", 40.0))]
+    index.reload()
+
+    assert sorted(sub.events) == [("added", 8, "d"), ("removed", 7, "a")]
+    assert index.counts([7, 8]) == {7: 1, 8: 2}
+
+
+def test_reload_single_restaurant_leaves_others_untouched():
+    rows = [(7, _order("a", 10.0)), (8, _order("c", 30.0))]
+    index = _index(rows)
+    sub = Recorder()
+    index.subscribe(sub)
+
+    rows[:] = []
+    index.reload(7)
+
+    assert sub.events == [("removed", 7, "a")]
+    assert index.count(7) == 0
+    assert _ids(index, 8) == ["c"]
+
+
+def _add_event(order_id, origin, items):
+    return {
+        "op": "add", "origin": origin, "restaurant_id": 7,
+        "order": {"id": order_id, "user_id": 1, "amount": 50.0,
+                  "items": items, "created_at": 10.0},
+    }
+
+
+def test_apply_event_ignores_own_process_events():
+    index = _index([])
+
+    index.apply_event(_add_event("own", process_origin(), ["Pizza"]))
+    index.apply_event({"op": "remove", "origin": process_origin(),
+                       "restaurant_id": 7, "order_id": "own"})
+
+    assert index.count(7) == 0
+
+
+def test_apply_event_applies_other_process_events():
+    index = _index([])
+
+    index.apply_event(_add_event("x", "other-process", 3))
+    index.apply_event(_add_event("y", "other-process", "Pizza"))
+
+    # items JSONB değeri olduğu gibi tutulur.
+    assert [o.to_dict(7)["items"] for o in index.orders(7)] == [3, "Pizza"]
+
+    index.apply_event({"op": "remove", "origin": "other-process",
+                       "restaurant_id": 7, "order_id": "x"})
+    assert _ids(index, 7) == ["y"]
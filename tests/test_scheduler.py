@@ -0,0 +1,147 @@
+"""
+DeadlineScheduler testleri.
+
+İşçi thread'i başlatılmaz; zaman next_batch / run_pending'e açıkça verilir.
+"""
+
+import pytest
+
+from scheduler import DeadlineScheduler
+
+
+def _scheduler(**kwargs):
+    return DeadlineScheduler({}, **kwargs)
+
+
+def _restaurants(batch):
+    return [t.restaurant_id for t in batch]
+
+
+def test_due_order_within_restaurant():
+    s = _scheduler()
+    s.schedule("auto_reject", "b", 1, due=20)
+    s.schedule("auto_reject", "a", 1, due=10)
+    s.schedule("auto_reject", "c", 1, due=30)
+
+    assert [t.key for t in s.next_batch(now=25)] == ["a", "b"]
+    assert [t.key for t in s.next_batch(now=30)] == ["c"]
+    assert len(s) == 0
+
+
+def test_busy_restaurant_does_not_starve_others():
+    s = _scheduler()
+    for i in range(1000):
+        s.schedule("auto_reject", f"big-{i}", 1, due=0)
+    s.schedule("auto_reject", "small", 2, due=0)
+
+    assert 2 in _restaurants(s.next_batch(now=1, limit=2))
+
+
+def test_weighted_interleaving():
+    s = _scheduler()
+    s.set_weight(1, 2)
+    for i in range(30):
+        s.schedule("auto_reject", f"r1-{i}", 1, due=0)
+        s.schedule("auto_reject", f"r2-{i}", 2, due=0)
+
+    batch = _restaurants(s.next_batch(now=1, limit=30))
+
+    assert batch.count(1) == 20
+    assert batch.count(2) == 10
+    # Paylar batch boyunca dağılır; bir restoranın işleri arka arkaya yığılmaz.
+    for i in range(0, 30, 3):
+        assert sorted(batch[i:i + 3]) == [1, 1, 2]
+
+
+def test_cancel():
+    s = _scheduler()
+    s.schedule("auto_reject", "a", 1, due=10)
+    s.schedule("auto_reject", "b", 1, due=10)
+
+    assert s.cancel("auto_reject", "a") is True
+    assert s.cancel("auto_reject", "a") is False
+    assert [t.key for t in s.next_batch(now=10)] == ["b"]
+
+
+def test_reschedule_replaces_due():
+    s = _scheduler()
+    s.schedule("auto_reject", "a", 1, due=10)
+    s.schedule("auto_reject", "a", 1, due=50)
+
+    assert len(s) == 1
+    assert s.next_batch(now=20) == []
+    assert [t.due for t in s.next_batch(now=50)] == [50]
+
+
+def test_cancelled_entries_are_compacted():
+    s = _scheduler()
+    for i in range(3000):
+        s.schedule("auto_reject", i, i % 10, due=i)
+    for i in range(2000):
+        s.cancel("auto_reject", i)
+
+    # Ölü kayıtlar yarıyı geçince heap sıkıştırılır.
+    assert len(s._timers) < 3000
+    assert s._dead < 1024
+
+    assert [t.key for t in s.next_batch(now=3000, limit=5000)] == list(range(2000, 3000))
+    assert s._dead == 0
+    assert s._timers == []
+
+
+def test_idle_restaurant_does_not_jump_ahead():
+    s = _scheduler()
+    for i in range(10):
+        s.schedule("auto_reject", f"r1-{i}", 1, due=0)
+    assert _restaurants(s.next_batch(now=0)) == [1] * 10
+
+    # Restoran 2 şimdiye kadar boştaydı; biriktirdiği payla 10 işi arka
+    # arkaya almamalı, restoran 1 ile dönüşümlü işlenmeli.
+    for i in range(10):
+        s.schedule("auto_reject", f"r1-late-{i}", 1, due=1)
+        s.schedule("auto_reject", f"r2-{i}", 2, due=1)
+
+    batch = _restaurants(s.next_batch(now=1, limit=6))
+    assert batch.count(1) == 3
+    assert batch.count(2) == 3
+
+
+def test_failed_task_is_retried_with_backoff():
+    calls = []
+
+    def handler(task):
+        calls.append(task.attempts)
+        raise RuntimeError("geçici hata")
+
+    s = DeadlineScheduler({"auto_reject": handler}, retry_delay_s=5, max_retry_delay_s=12)
+    s.schedule("auto_reject", "a", 1, due=0)
+
+    assert s.run_pending(now=0) == 1
+    assert s.run_pending(now=4) == 0
+    assert s.run_pending(now=5) == 1
+    assert s.run_pending(now=14) == 0
+    assert s.run_pending(now=15) == 1
+    # Gecikme üst sınırda kalır: 5, 10, 12, 12...
+    assert s.run_pending(now=27) == 1
+    assert calls == [0, 1, 2, 3]
+    assert len(s) == 1
+
+
+def test_retry_does_not_override_rescheduled_task():
+    s = None
+
+    def handler(task):
+        s.schedule("auto_reject", task.key, task.restaurant_id, due=100)
+        raise RuntimeError("geçici hata")
+
+    s = DeadlineScheduler({"auto_reject": handler}, retry_delay_s=5)
+    s.schedule("auto_reject", "a", 1, due=0)
+    s.run_pending(now=0)
+
+    assert s.next_batch(now=50) == []
+    assert [t.due for t in s.next_batch(now=100)] == [100]
+
+
+def test_rejects_invalid_weight():
+    with pytest.raises(ValueError):
+        _scheduler().set_weight(1, 0)
@@ -0,0 +1,214 @@
+"""
+Sharding testleri.
+
+Veritabanı gerekmez: halka ve ayar ayrıştırma saf Python; _delete_copied
+gönderdiği SQL'i ve parametreleri kaydeden sahte engine'lerle çalıştırılır.
+"""
+
+import contextlib
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from sharding import (
+    HashRing,
+    ShardMoving,
+    ShardRouter,
+    _delete_copied,
+    parse_shard_urls,
+)
+
+KEYS = range(1, 10_001)
+
+
+# ----------------------------
+#  HashRing
+# ----------------------------
+
+def test_ring_mapping_is_stable():
+    a = HashRing(["default", "s1", "s2"])
+    b = HashRing(["s2", "default", "s1"])
+
+    assert all(a.node_for(k) == b.node_for(k) for k in KEYS)
+    # int ve str anahtar aynı yere düşer (restaurant_id her iki şekilde gelebilir).
+    assert a.node_for(42) == a.node_for("42")
+
+
+def test_ring_spreads_keys_over_all_nodes():
+    ring = HashRing(["default", "s1", "s2"])
+    counts = {}
+    for k in KEYS:
+        node = ring.node_for(k)
+        counts[node] = counts.get(node, 0) + 1
+
+    assert set(counts) == {"default", "s1", "s2"}
+    assert min(counts.values()) > len(KEYS) * 0.2
+
+
+def test_adding_a_node_moves_few_keys():
+    before = HashRing(["default", "s1"])
+    after = HashRing(["default", "s1", "s2"])
+
+    moved = [k for k in KEYS if before.node_for(k) != after.node_for(k)]
+
+    # İdeal oran 1/3; taşınan her anahtar yeni shard'a gider.
+    assert len(moved) < len(KEYS) * 0.45
+    assert all(after.node_for(k) == "s2" for k in moved)
+
+
+def test_ring_rejects_invalid_parameters():
+    with pytest.raises(ValueError):
+        HashRing([])
+    with pytest.raises(ValueError):
+        HashRing(["default"], vnodes=0)
+
+
+# ----------------------------
+#  parse_shard_urls
+# ----------------------------
+
+def test_parse_shard_urls():
+    assert parse_shard_urls("") == {"default": None}
+    assert parse_shard_urls(" default , s1 = postgresql://h/s1 ,") == {
+        "default": None,
+        "s1": "postgresql://h/s1",
+    }
+
+
+@pytest.mark.parametrize("raw", [
+    "default,s1=postgresql://h/a,s1=postgresql://h/b",   # tekrar eden ad
+    "default,s1",                                        # adres yok
+    "s1=postgresql://h/s1,s2=postgresql://h/s2",         # default yok
+])
+def test_parse_shard_urls_errors(raw):
+    with pytest.raises(ValueError):
+        parse_shard_urls(raw)
+
+
+def test_parse_shard_urls_allows_missing_default_explicitly():
+    raw = "s1=postgresql://h/s1,s2=postgresql://h/s2"
+    assert parse_shard_urls(raw, allow_missing_default=True) == {
+        "s1": "postgresql://h/s1",
+        "s2": "postgresql://h/s2",
+    }
+
+
+# ----------------------------
+#  ShardRouter
+# ----------------------------
+
+def _router(overrides=None, moving=()):
+    engines = {"default": object(), "s1": object()}
+    router = ShardRouter(engines, engines["default"], override_ttl_s=3600)
+    # Override tablosu okunmasın diye önbellek taze gösterilir.
+    router._overrides = dict(overrides or {})
+    router._moving = frozenset(moving)
+    router._overrides_loaded_at = time.monotonic()
+    return router
+
+
+def test_override_wins_over_ring():
+    router = _router()
+    rid = next(k for k in KEYS if router.ring.node_for(k) == "default")
+    router._overrides = {rid: "s1"}
+
+    assert router.shard_for(rid) == "s1"
+
+
+def test_unknown_override_shard_falls_back_to_ring():
+    router = _router()
+    router._overrides = {7: "removed-shard"}
+
+    assert router.shard_for(7) == router.ring.node_for(7)
+
+
+def test_writes_blocked_while_moving():
+    router = _router(moving={7})
+
+    assert router.shard_for(7) == router.ring.node_for(7)
+    with pytest.raises(ShardMoving) as exc:
+        router.write_shard_for(7)
+    assert exc.value.restaurant_id == 7
+    assert router.write_shard_for(8) == router.ring.node_for(8)
+
+
+# ----------------------------
+#  _delete_copied
+# ----------------------------
+
+Row = namedtuple("Row", "id last_updated_at")
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeConn:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def execute(self, stmt, params):
+        sql = str(stmt)
+        self.engine.statements.append((sql, params))
+        if sql.startswith("SELECT"):
+            rows = sorted(
+                (Row(i, t) for i, t in self.engine.rows.items() if i > params["last_id"]),
+                key=lambda r: r.id,
+            )
+            return _Result(rows[:params["limit"]])
+        # DELETE: sadece hedefteki damgadan eski veya eşit satırlar silinir.
+        assert "o.last_updated_at <= t.last_updated_at" in sql
+        assert "o.restaurant_id = :restaurant_id" in sql
+        deleted = 0
+        for i, stamp in zip(params["ids"], params["stamps"]):
+            if i in self.engine.rows and self.engine.rows[i] <= stamp:
+                del self.engine.rows[i]
+                deleted += 1
+        return _Result(rowcount=deleted)
+
+
+class _Result:
+    def __init__(self, rows=(), rowcount=0):
+        self._rows = list(rows)
+        self.rowcount = rowcount
+
+    def all(self):
+        return self._rows
+
+
+class FakeEngine:
+    def __init__(self, rows):
+        self.rows = dict(rows)   # id -> last_updated_at
+        self.statements = []
+
+    @contextlib.contextmanager
+    def connect(self):
+        yield FakeConn(self)
+
+    begin = connect
+
+
+def test_delete_copied_removes_only_verified_rows():
+    source = FakeEngine({
+        "a": T0,                           # hedefle aynı -> silinir
+        "b": T0,                           # hedefte daha yeni -> silinir
+        "c": T0 + timedelta(seconds=5),    # kaynakta sonradan güncellendi -> kalır
+        "d": T0,                           # hedefe hiç kopyalanmadı -> kalır
+        "e": T0,
+    })
+    target = FakeEngine({
+        "a": T0,
+        "b": T0 + timedelta(seconds=1),
+        "c": T0,
+        "e": T0,
+    })
+
+    deleted = _delete_copied(source, target, restaurant_id=7, batch_size=2)
+
+    assert deleted == 3
+    assert set(source.rows) == {"c", "d"}
+    # Hedef sayfa sayfa okunur ve her sayfa için tek DELETE gönderilir.
+    deletes = [p for sql, p in source.statements if sql.startswith("DELETE")]
+    assert [p["ids"] for p in deletes] == [["a", "b"], ["c", "e"]]
+    assert all(p["restaurant_id"] == 7 for p in deletes)
+    # Hedefe yazma yapılmaz.
+    assert all(sql.startswith("SELECT") for sql, _ in target.statements)
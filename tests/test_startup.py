@@ -0,0 +1,68 @@
+"""
+Soğuk başlangıç testleri.
+
+Her ölçüm yeni bir Python sürecinde yapılır (modül cache'i yok). Bütçe
+mutlak süre değil, uygulamanın zorunlu bağımlılıklarını (Flask,
+Flask-SQLAlchemy, SQLAlchemy) import etme süresine oran olarak verilir;
+böylece makine hızı sadeleşir. create_app() şu an bağımlılıkların ~1.1
+katı sürer; ağır bir modülün (ör. requests + MCP) yeniden import sırasında
+yüklenmesi 1.3'ü aşar. Ayrıntılı ölçüm için: python bench/import_time_bench.py
+
+Ortam değişkenleri:
+  - IMPORT_BUDGET_RATIO: create_app() / bağımlılık import süresi üst sınırı (varsayılan 1.3)
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# import app + create_app() sonrasında yüklenmemesi gereken modüller.
+LAZY_MODULES = ["requests", "scheduler", "group_commit", "mcp.server", "mcp.db_tools"]
+
+CREATE_APP = "import app; app.create_app(start_background=False)"
+DEPENDENCIES = "import click, flask, flask_cors, flask_sqlalchemy, sqlalchemy.dialects.postgresql"
+
+
+def _env():
+    # Sürücüden bağımsız olsun diye bellek içi SQLite; create_app bağlantı açmaz.
+    return dict(os.environ, DATABASE_URL="sqlite://", SHARD_DATABASE_URLS="")
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=_env(),
+        check=True, capture_output=True, text=True,
+    )
+
+
+def _fastest_ms(code: str, rounds: int = 5) -> float:
+    times = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        _run(code)
+        times.append((time.perf_counter() - t0) * 1000)
+    return min(times)
+
+
+def test_create_app_does_not_import_lazy_modules():
+    code = (
+        f"import sys; {CREATE_APP}; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    loaded = [m for m in _run(code).stdout.strip().split(",") if m]
+    assert loaded == []
+
+
+def test_create_app_within_import_budget():
+    budget = float(os.getenv("IMPORT_BUDGET_RATIO", "1.3"))
+    baseline_ms = _fastest_ms("pass")
+    deps_ms = _fastest_ms(DEPENDENCIES) - baseline_ms
+    app_ms = _fastest_ms(CREATE_APP) - baseline_ms
+    ratio = app_ms / deps_ms
+    assert ratio <= budget, (
+        f"create_app() {app_ms:.0f} ms, bağımlılıklar {deps_ms:.0f} ms: "
+        f"oran {ratio:.2f} > bütçe {budget:.2f}"
+    )